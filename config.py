@@ -5,120 +5,109 @@ This module provides configuration management using environment variables.
 """
 
 import os
-from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from typing import Literal, Optional
 from dotenv import load_dotenv
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Snapshot of the environment, read by the from_env() loaders below
+_ENV = dict(os.environ)
 
-@dataclass
-class DatabricksConfig:
+
+class _EnvModel(BaseModel):
+    """
+    Base for configuration sections loaded from environment variables.
+
+    Fields are validated once at construction and read only by their
+    environment variable names, so unrelated variables such as a lowercase
+    `host` or `password` can never fill a field. Instances are
+    frozen because from_env() shares a single cached instance, and inputs are
+    left out of error messages so the environment is never echoed.
+    """
+    model_config = ConfigDict(frozen=True, hide_input_in_errors=True)
+
+
+class DatabricksConfig(_EnvModel):
     """Databricks configuration."""
-    warehouse_id: str
-    host: Optional[str] = None
-    token: Optional[str] = None
+    warehouse_id: str = Field(validation_alias='DATABRICKS_WAREHOUSE_ID', min_length=1)
+    host: Optional[str] = Field(default=None, validation_alias='DATABRICKS_HOST')
+    token: Optional[str] = Field(default=None, validation_alias='DATABRICKS_TOKEN')
 
     @classmethod
+    @lru_cache(maxsize=1)
     def from_env(cls) -> 'DatabricksConfig':
         """Load Databricks configuration from environment variables."""
-        return cls(
-            warehouse_id=os.getenv('DATABRICKS_WAREHOUSE_ID', ''),
-            host=os.getenv('DATABRICKS_HOST'),
-            token=os.getenv('DATABRICKS_TOKEN')
-        )
+        return cls.model_validate(_ENV)
 
 
-@dataclass
-class SMTPConfig:
+class SMTPConfig(_EnvModel):
     """SMTP email configuration."""
-    host: str
-    port: int
-    user: str
-    password: str
-    from_email: str
-    use_tls: bool = True
+    host: str = Field(validation_alias='SMTP_HOST', min_length=1)
+    port: int = Field(default=587, validation_alias='SMTP_PORT')
+    user: str = Field(validation_alias='SMTP_USER', min_length=1)
+    password: str = Field(validation_alias='SMTP_PASSWORD', min_length=1)
+    from_email: str = Field(validation_alias='FROM_EMAIL', min_length=1)
+    use_tls: bool = Field(default=True, validation_alias='SMTP_USE_TLS')
 
     @classmethod
+    @lru_cache(maxsize=1)
     def from_env(cls) -> 'SMTPConfig':
         """Load SMTP configuration from environment variables."""
-        return cls(
-            host=os.getenv('SMTP_HOST', ''),
-            port=int(os.getenv('SMTP_PORT', '587')),
-            user=os.getenv('SMTP_USER', ''),
-            password=os.getenv('SMTP_PASSWORD', ''),
-            from_email=os.getenv('FROM_EMAIL', ''),
-            use_tls=os.getenv('SMTP_USE_TLS', 'true').lower() == 'true'
-        )
-
-
-@dataclass
-class ExportConfig:
+        return cls.model_validate(_ENV)
+
+
+class ExportConfig(_EnvModel):
     """Export configuration."""
-    output_dir: str = './exports'
-    page_size: str = 'LETTER'  # LETTER or A4
-    orientation: str = 'landscape'  # landscape or portrait
-    max_rows: int = 10000
+    output_dir: str = Field(default='./exports', validation_alias='EXPORT_OUTPUT_DIR')
+    page_size: Literal['LETTER', 'A4'] = Field(default='LETTER', validation_alias='EXPORT_PAGE_SIZE')
+    orientation: Literal['landscape', 'portrait'] = Field(
+        default='landscape', validation_alias='EXPORT_ORIENTATION'
+    )
+    max_rows: int = Field(default=10000, validation_alias='EXPORT_MAX_ROWS')
 
     @classmethod
+    @lru_cache(maxsize=1)
     def from_env(cls) -> 'ExportConfig':
         """Load export configuration from environment variables."""
-        return cls(
-            output_dir=os.getenv('EXPORT_OUTPUT_DIR', './exports'),
-            page_size=os.getenv('EXPORT_PAGE_SIZE', 'LETTER'),
-            orientation=os.getenv('EXPORT_ORIENTATION', 'landscape'),
-            max_rows=int(os.getenv('EXPORT_MAX_ROWS', '10000'))
-        )
+        return cls.model_validate(_ENV)
 
 
-@dataclass
-class AppConfig:
+class AppConfig(BaseModel):
     """Complete application configuration."""
+    model_config = ConfigDict(frozen=True, hide_input_in_errors=True)
+
     databricks: DatabricksConfig
     smtp: SMTPConfig
     export: ExportConfig
 
     @classmethod
+    @lru_cache(maxsize=1)
     def from_env(cls) -> 'AppConfig':
-        """Load complete application configuration from environment variables."""
-        return cls(
-            databricks=DatabricksConfig.from_env(),
-            smtp=SMTPConfig.from_env(),
-            export=ExportConfig.from_env()
-        )
-
-    def validate(self) -> List[str]:
         """
-        Validate configuration and return list of errors.
+        Load complete application configuration from environment variables.
+
+        The result is cached; call refresh_env_cache() to pick up changes.
 
-        Returns:
-            List of validation error messages (empty if valid)
+        Raises:
+            pydantic.ValidationError: Listing every missing or invalid setting
         """
-        errors = []
-
-        # Validate Databricks config
-        if not self.databricks.warehouse_id:
-            errors.append("DATABRICKS_WAREHOUSE_ID is required")
-
-        # Validate SMTP config
-        if not self.smtp.host:
-            errors.append("SMTP_HOST is required")
-        if not self.smtp.user:
-            errors.append("SMTP_USER is required")
-        if not self.smtp.password:
-            errors.append("SMTP_PASSWORD is required")
-        if not self.smtp.from_email:
-            errors.append("FROM_EMAIL is required")
-
-        # Validate export config
-        if self.export.page_size not in ['LETTER', 'A4']:
-            errors.append(f"Invalid EXPORT_PAGE_SIZE: {self.export.page_size} (must be LETTER or A4)")
-        if self.export.orientation not in ['landscape', 'portrait']:
-            errors.append(f"Invalid EXPORT_ORIENTATION: {self.export.orientation} (must be landscape or portrait)")
-
-        return errors
+        return cls.model_validate({'databricks': _ENV, 'smtp': _ENV, 'export': _ENV})
+
+
+def refresh_env_cache() -> None:
+    """Reload the .env file and rebuild the cached environment snapshot.
+
+    Configuration objects cached by the from_env() loaders are discarded too.
+    """
+    load_dotenv()
+    _ENV.clear()
+    _ENV.update(os.environ)
+    for config_cls in (DatabricksConfig, SMTPConfig, ExportConfig, AppConfig):
+        config_cls.from_env.cache_clear()
 
 
 # Example configuration presets
@@ -5,9 +5,34 @@ Example usage scripts for the Dashboard Export Tool
 This file contains several practical examples of how to use the DashboardExporter class.
 """
 
-import os
+import asyncio
 from datetime import datetime, timedelta
-from export_dashboard import DashboardExporter
+from functools import lru_cache
+
+from databricks.sdk.service.sql import StatementParameterListItem
+from pydantic import ValidationError
+
+from config import AppConfig
+from export_dashboard import DashboardExporter, configure_logging
+
+
+@lru_cache(maxsize=1)
+def _make_exporter() -> DashboardExporter:
+    """
+    Return the exporter shared by all examples.
+
+    Building it once means the workspace client and SMTP connection are set
+    up once per run rather than once per example.
+    """
+    config = AppConfig.from_env()
+    return DashboardExporter(
+        warehouse_id=config.databricks.warehouse_id,
+        smtp_host=config.smtp.host,
+        smtp_port=config.smtp.port,
+        smtp_user=config.smtp.user,
+        smtp_password=config.smtp.password,
+        from_email=config.smtp.from_email
+    )
 
 
 def example_1_simple_export():
@@ -17,14 +42,7 @@ def example_1_simple_export():
     """
     print("\n=== Example 1: Simple Export ===")
 
-    exporter = DashboardExporter(
-        warehouse_id=os.getenv('DATABRICKS_WAREHOUSE_ID'),
-        smtp_host=os.getenv('SMTP_HOST'),
-        smtp_port=int(os.getenv('SMTP_PORT', '587')),
-        smtp_user=os.getenv('SMTP_USER'),
-        smtp_password=os.getenv('SMTP_PASSWORD'),
-        from_email=os.getenv('FROM_EMAIL')
-    )
+    exporter = _make_exporter()
 
     SQL_QUERY = """
     SELECT
@@ -52,19 +70,12 @@ def example_2_daily_sales_report():
     """
     print("\n=== Example 2: Daily Sales Report ===")
 
-    exporter = DashboardExporter(
-        warehouse_id=os.getenv('DATABRICKS_WAREHOUSE_ID'),
-        smtp_host=os.getenv('SMTP_HOST'),
-        smtp_port=int(os.getenv('SMTP_PORT', '587')),
-        smtp_user=os.getenv('SMTP_USER'),
-        smtp_password=os.getenv('SMTP_PASSWORD'),
-        from_email=os.getenv('FROM_EMAIL')
-    )
+    exporter = _make_exporter()
 
     # Query for yesterday's sales
     yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
 
-    SQL_QUERY = f"""
+    SQL_QUERY = """
     SELECT
         date,
         region,
@@ -73,7 +84,7 @@ def example_2_daily_sales_report():
         order_count,
         avg_order_value
     FROM sales.daily_summary
-    WHERE date = '{yesterday}'
+    WHERE date = :report_date
     ORDER BY total_sales DESC
     """
 
@@ -84,7 +95,10 @@ def example_2_daily_sales_report():
         title='Daily Sales Performance',
         cc_emails=['manager@company.com'],
         page_size='LETTER',
-        orientation='landscape'
+        orientation='landscape',
+        parameters=[
+            StatementParameterListItem(name='report_date', value=yesterday, type='DATE')
+        ]
     )
 
 
@@ -95,14 +109,7 @@ def example_3_custom_pdf_only():
     """
     print("\n=== Example 3: PDF Only (No Email) ===")
 
-    exporter = DashboardExporter(
-        warehouse_id=os.getenv('DATABRICKS_WAREHOUSE_ID'),
-        smtp_host=os.getenv('SMTP_HOST'),
-        smtp_port=int(os.getenv('SMTP_PORT', '587')),
-        smtp_user=os.getenv('SMTP_USER'),
-        smtp_password=os.getenv('SMTP_PASSWORD'),
-        from_email=os.getenv('FROM_EMAIL')
-    )
+    exporter = _make_exporter()
 
     SQL_QUERY = """
     SELECT
@@ -138,14 +145,7 @@ def example_4_weekly_summary():
     """
     print("\n=== Example 4: Weekly Summary ===")
 
-    exporter = DashboardExporter(
-        warehouse_id=os.getenv('DATABRICKS_WAREHOUSE_ID'),
-        smtp_host=os.getenv('SMTP_HOST'),
-        smtp_port=int(os.getenv('SMTP_PORT', '587')),
-        smtp_user=os.getenv('SMTP_USER'),
-        smtp_password=os.getenv('SMTP_PASSWORD'),
-        from_email=os.getenv('FROM_EMAIL')
-    )
+    exporter = _make_exporter()
 
     SQL_QUERY = """
     SELECT
@@ -181,14 +181,7 @@ def example_5_large_dataset():
     """
     print("\n=== Example 5: Large Dataset Export ===")
 
-    exporter = DashboardExporter(
-        warehouse_id=os.getenv('DATABRICKS_WAREHOUSE_ID'),
-        smtp_host=os.getenv('SMTP_HOST'),
-        smtp_port=int(os.getenv('SMTP_PORT', '587')),
-        smtp_user=os.getenv('SMTP_USER'),
-        smtp_password=os.getenv('SMTP_PASSWORD'),
-        from_email=os.getenv('FROM_EMAIL')
-    )
+    exporter = _make_exporter()
 
     # Query with LIMIT to manage size
     SQL_QUERY = """
@@ -211,7 +204,8 @@ def example_5_large_dataset():
         subject='30-Day Transaction Report (Top 5000)',
         title='Recent Transactions - Last 30 Days',
         page_size='A4',
-        orientation='landscape'
+        orientation='landscape',
+        max_rows=5000  # Large limits fetch results as Arrow via external links
     )
 
 
@@ -222,14 +216,7 @@ def example_6_conditional_export():
     """
     print("\n=== Example 6: Conditional Export ===")
 
-    exporter = DashboardExporter(
-        warehouse_id=os.getenv('DATABRICKS_WAREHOUSE_ID'),
-        smtp_host=os.getenv('SMTP_HOST'),
-        smtp_port=int(os.getenv('SMTP_PORT', '587')),
-        smtp_user=os.getenv('SMTP_USER'),
-        smtp_password=os.getenv('SMTP_PASSWORD'),
-        from_email=os.getenv('FROM_EMAIL')
-    )
+    exporter = _make_exporter()
 
     # Query for high-priority alerts
     SQL_QUERY = """
@@ -250,13 +237,13 @@ def example_6_conditional_export():
     data = exporter.execute_query(SQL_QUERY)
 
     # Only send email if there are critical alerts
-    if len(data) > 0:
-        print(f"Found {len(data)} critical alerts. Sending notification...")
+    if len(data.rows) > 0:
+        print(f"Found {len(data.rows)} critical alerts. Sending notification...")
 
         exporter.export_and_email(
             sql_query=SQL_QUERY,
             to_emails=['oncall@company.com'],
-            subject=f'ALERT: {len(data)} Critical System Alerts Detected',
+            subject=f'ALERT: {len(data.rows)} Critical System Alerts Detected',
             title='Critical System Alerts',
             cc_emails=['devops@company.com']
         )
@@ -271,29 +258,27 @@ def example_7_multiple_queries():
     """
     print("\n=== Example 7: Multiple Queries Combined ===")
 
-    exporter = DashboardExporter(
-        warehouse_id=os.getenv('DATABRICKS_WAREHOUSE_ID'),
-        smtp_host=os.getenv('SMTP_HOST'),
-        smtp_port=int(os.getenv('SMTP_PORT', '587')),
-        smtp_user=os.getenv('SMTP_USER'),
-        smtp_password=os.getenv('SMTP_PASSWORD'),
-        from_email=os.getenv('FROM_EMAIL')
-    )
+    exporter = _make_exporter()
+
+    # The queries are independent, so run them concurrently
+    async def run_queries():
+        return await asyncio.gather(
+            # Query 1: Top products
+            exporter.execute_query_async("""
+                SELECT product_name, total_sales
+                FROM products.summary
+                ORDER BY total_sales DESC
+                LIMIT 10
+            """),
+            # Query 2: Regional performance
+            exporter.execute_query_async("""
+                SELECT region, revenue, growth_rate
+                FROM regions.performance
+                ORDER BY revenue DESC
+            """),
+        )
 
-    # Query 1: Top products
-    query1_data = exporter.execute_query("""
-        SELECT product_name, total_sales
-        FROM products.summary
-        ORDER BY total_sales DESC
-        LIMIT 10
-    """)
-
-    # Query 2: Regional performance
-    query2_data = exporter.execute_query("""
-        SELECT region, revenue, growth_rate
-        FROM regions.performance
-        ORDER BY revenue DESC
-    """)
+    query1_data, query2_data = asyncio.run(run_queries())
 
     # Note: This example shows the pattern, but you'd need to modify
     # create_pdf to handle multiple datasets. For now, use one query.
@@ -309,27 +294,20 @@ def example_8_scheduled_export():
     print("\n=== Example 8: Scheduled Export Template ===")
 
     try:
-        exporter = DashboardExporter(
-            warehouse_id=os.getenv('DATABRICKS_WAREHOUSE_ID'),
-            smtp_host=os.getenv('SMTP_HOST'),
-            smtp_port=int(os.getenv('SMTP_PORT', '587')),
-            smtp_user=os.getenv('SMTP_USER'),
-            smtp_password=os.getenv('SMTP_PASSWORD'),
-            from_email=os.getenv('FROM_EMAIL')
-        )
+        exporter = _make_exporter()
 
         # Determine report period based on current day
         today = datetime.now()
         report_date = today.strftime('%Y-%m-%d')
 
-        SQL_QUERY = f"""
+        SQL_QUERY = """
         SELECT
             metric_name,
             metric_value,
             target_value,
             variance_percent
         FROM kpis.daily_metrics
-        WHERE report_date = '{report_date}'
+        WHERE report_date = :report_date
         ORDER BY metric_name
         """
 
@@ -339,7 +317,10 @@ def example_8_scheduled_export():
             subject=f'Daily KPI Report - {report_date}',
             title=f'Daily Key Performance Indicators - {report_date}',
             page_size='LETTER',
-            orientation='portrait'
+            orientation='portrait',
+            parameters=[
+                StatementParameterListItem(name='report_date', value=report_date, type='DATE')
+            ]
         )
 
         print(f"Scheduled export completed successfully at {today}")
@@ -358,21 +339,14 @@ if __name__ == "__main__":
     print("Dashboard Export Tool - Example Usage")
     print("=" * 50)
 
-    # Make sure environment variables are set
-    from dotenv import load_dotenv
-    load_dotenv()
-
-    required_vars = [
-        'DATABRICKS_WAREHOUSE_ID',
-        'SMTP_HOST',
-        'SMTP_USER',
-        'SMTP_PASSWORD',
-        'FROM_EMAIL'
-    ]
-
-    missing = [v for v in required_vars if not os.getenv(v)]
-    if missing:
-        print(f"\nError: Missing environment variables: {', '.join(missing)}")
+    # Show the exporter's progress messages at the LOG_LEVEL from .env
+    configure_logging()
+
+    # Environment variables are loaded from .env when config is imported
+    try:
+        AppConfig.from_env()
+    except ValidationError as e:
+        print(f"\nError: Invalid configuration:\n{e}")
         print("Please configure your .env file before running examples.")
         exit(1)
 
@@ -387,5 +361,9 @@ if __name__ == "__main__":
     # example_7_multiple_queries()
     # example_8_scheduled_export()
 
+    # Close the SMTP connection shared by the examples
+    if _make_exporter.cache_info().currsize:
+        _make_exporter().close()
+
     print("\nNote: All examples are commented out by default.")
     print("Edit this file to uncomment and run specific examples.")
@@ -6,26 +6,233 @@ This script exports a large dashboard table from Databricks AI/BI Dashboards,
 converts it to PDF, and sends it via email.
 """
 
+import base64
 import os
-import sys
-import csv
 import io
+import logging
+import threading
+import time
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.application import MIMEApplication
-
-from databricks.sdk import WorkspaceClient
-from databricks.sdk.service.sql import StatementState, Format, Disposition
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4, landscape
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, NamedTuple, Tuple, Union, BinaryIO
+
+if TYPE_CHECKING:
+    import pyarrow
+    from databricks.sdk.service.sql import StatementParameterListItem
+
+logger = logging.getLogger(__name__)
+
+# Results expected to exceed this many rows are fetched as Arrow via external links
+ARROW_ROW_THRESHOLD = 1000
+
+# Seconds a statement may run in total before it is cancelled
+QUERY_TIMEOUT_SECONDS = 600
+
+# Number of external link chunks downloaded concurrently
+ARROW_FETCH_WORKERS = 8
+
+# Results with more rows than this are drawn directly on a canvas by default
+FAST_PDF_ROW_THRESHOLD = 500
+
+
+@lru_cache(maxsize=None)
+def _get_reportlab() -> SimpleNamespace:
+    """Import the reportlab names used for PDF generation on first use."""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.pagesizes import A4, landscape, letter
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from reportlab.pdfgen.canvas import Canvas
+    from reportlab.platypus import LongTable, Paragraph, SimpleDocTemplate, Spacer, TableStyle
+
+    return SimpleNamespace(
+        colors=colors,
+        letter=letter,
+        A4=A4,
+        landscape=landscape,
+        getSampleStyleSheet=getSampleStyleSheet,
+        ParagraphStyle=ParagraphStyle,
+        inch=inch,
+        SimpleDocTemplate=SimpleDocTemplate,
+        LongTable=LongTable,
+        TableStyle=TableStyle,
+        Paragraph=Paragraph,
+        Spacer=Spacer,
+        TA_CENTER=TA_CENTER,
+        stringWidth=stringWidth,
+        Canvas=Canvas,
+    )
+
+
+def _resolve_page_size(page_size: str, orientation: str) -> tuple:
+    """Return the reportlab page dimensions for a page size and orientation."""
+    rl = _get_reportlab()
+    page = rl.A4 if page_size.upper() == "A4" else rl.letter
+    if orientation.lower() == "landscape":
+        page = rl.landscape(page)
+    return page
+
+
+@lru_cache(maxsize=None)
+def _compute_col_widths(page: tuple, ncols: int) -> Tuple[float, ...]:
+    """Split the usable page width evenly between the table columns."""
+    page_width = page[0] - 1*_get_reportlab().inch  # Account for margins
+    return (page_width / ncols,) * ncols
+
+
+@lru_cache(maxsize=None)
+def _build_table_style():
+    """Return the TableStyle shared by every exported table."""
+    rl = _get_reportlab()
+    colors = rl.colors
+    return rl.TableStyle([
+        # Header styling
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, 0), 12),
+
+        # Body styling
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('TOPPADDING', (0, 1), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+
+        # Alternating row colors
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
+
+        # Grid
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
+
+
+@lru_cache(maxsize=None)
+def _get_paragraph_styles() -> SimpleNamespace:
+    """Return the title, subtitle and footer paragraph styles."""
+    rl = _get_reportlab()
+    colors = rl.colors
+    styles = rl.getSampleStyleSheet()
+    return SimpleNamespace(
+        title=rl.ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=16,
+            textColor=colors.HexColor('#1a1a1a'),
+            spaceAfter=12,
+            alignment=rl.TA_CENTER
+        ),
+        subtitle=rl.ParagraphStyle(
+            'CustomSubtitle',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor=colors.HexColor('#666666'),
+            spaceAfter=20,
+            alignment=rl.TA_CENTER
+        ),
+        footer=rl.ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=8,
+            textColor=colors.HexColor('#666666'),
+            alignment=rl.TA_CENTER
+        ),
+    )
+
+
+def _stringify_rows(rows) -> List[List[str]]:
+    """
+    Convert query result rows to lists of cell strings.
+
+    Nulls are rendered as empty cells. Arrow tables are cast to strings
+    column by column in Arrow's compute kernels, with floats and timestamps
+    formatted the way JSON_ARRAY results carry them (e.g. '2.0' and
+    '2024-01-15T10:30:00.000Z').
+    """
+    if isinstance(rows, list):
+        # JSON_ARRAY cells are already strings (or None), so skip str() for them
+        return [
+            [value if type(value) is str else ('' if value is None else str(value)) for value in row]
+            for row in rows
+        ]
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    str_columns = []
+    for column in rows.columns:
+        if pa.types.is_binary(column.type) or pa.types.is_large_binary(column.type):
+            # Render BINARY as base64, the way JSON_ARRAY results carry it
+            str_column = [
+                '' if value is None else base64.b64encode(value).decode('ascii')
+                for value in column.to_pylist()
+            ]
+        elif pa.types.is_floating(column.type):
+            # Arrow's cast drops the trailing '.0' of whole numbers
+            str_column = ['' if value is None else str(value) for value in column.to_pylist()]
+        elif pa.types.is_timestamp(column.type):
+            # ISO 8601 with millisecond precision, in UTC when zone-aware
+            tz = 'UTC' if column.type.tz else None
+            column = pc.cast(column, pa.timestamp('ms', tz=tz), safe=False)
+            str_column = pc.fill_null(
+                pc.strftime(column, format='%Y-%m-%dT%H:%M:%S' + ('Z' if tz else '')), ''
+            ).to_pylist()
+        else:
+            try:
+                str_column = pc.fill_null(pc.cast(column, pa.string()), '').to_pylist()
+            except (pa.ArrowNotImplementedError, pa.ArrowInvalid):
+                # No usable string cast (e.g. nested types); format in Python
+                str_column = ['' if value is None else str(value) for value in column.to_pylist()]
+        str_columns.append(str_column)
+    return [list(row) for row in zip(*str_columns)]
+
+
+def _fit_text(text: str, width: float, font_name: str, font_size: float) -> str:
+    """Truncate text so it fits in width points when drawn in the given font."""
+    string_width = _get_reportlab().stringWidth
+    # No Helvetica glyph is wider than about 1.02em, so short strings always fit
+    if len(text) * font_size * 1.02 <= width:
+        return text
+    if string_width(text, font_name, font_size) <= width:
+        return text
+
+    # Binary search for the longest prefix that fits with the ellipsis. No
+    # Helvetica glyph is narrower than about 0.19em, which bounds the search.
+    lo, hi = 0, min(len(text), int(width / (font_size * 0.19)) + 1)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if string_width(text[:mid] + '...', font_name, font_size) <= width:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + '...' if lo else ''
+
+
+class QueryResult(NamedTuple):
+    """
+    Query results as a column list plus positional row values.
+
+    rows is a list of row value lists for inline results, or a pyarrow.Table
+    for results fetched in Arrow format.
+    """
+    columns: List[str]
+    rows: Union[List[List[Any]], 'pyarrow.Table']
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Return the rows as a list of dictionaries keyed by column name."""
+        if not isinstance(self.rows, list):
+            return self.rows.to_pylist()
+        return [dict(zip(self.columns, row)) for row in self.rows]
 
 
 class DashboardExporter:
@@ -51,97 +258,260 @@ class DashboardExporter:
             smtp_password: SMTP authentication password
             from_email: Sender email address
         """
-        self.w = WorkspaceClient()
+        self._w = None
+        self._w_lock = threading.Lock()
         self.warehouse_id = warehouse_id
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
         self.smtp_user = smtp_user
         self.smtp_password = smtp_password
         self.from_email = from_email
-
-    def execute_query(self, sql_query: str) -> List[Dict[str, Any]]:
+        self._smtp = None
+
+    def __enter__(self) -> 'DashboardExporter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the cached SMTP connection, if one is open."""
+        import smtplib
+
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self._smtp.close()
+            self._smtp = None
+
+    @property
+    def w(self):
+        """Databricks workspace client, created on first use."""
+        if self._w is None:
+            # Concurrent first calls (e.g. execute_query_async) must share one
+            # client rather than each running auth discovery
+            with self._w_lock:
+                if self._w is None:
+                    from databricks.sdk import WorkspaceClient
+
+                    self._w = WorkspaceClient()
+        return self._w
+
+    def execute_query(
+        self,
+        sql_query: str,
+        max_rows: Optional[int] = None,
+        parameters: Optional[List['StatementParameterListItem']] = None,
+        timeout: float = QUERY_TIMEOUT_SECONDS
+    ) -> QueryResult:
         """
         Execute a SQL query and return results.
 
+        Results limited to more than ARROW_ROW_THRESHOLD rows are fetched in
+        Arrow format through external links instead of inline JSON.
+
         Args:
-            sql_query: SQL query to execute
+            sql_query: SQL query to execute, may reference :name parameter markers
+            max_rows: Optional limit on the number of rows returned
+            parameters: Optional values for the query's parameter markers, bound
+                server-side by the warehouse
+            timeout: Seconds to wait for the statement in total; it is cancelled
+                on the warehouse if it runs longer or the wait is interrupted
 
         Returns:
-            List of dictionaries representing rows
+            QueryResult with the column names and the row values
         """
-        print(f"Executing query on warehouse {self.warehouse_id}...")
+        from databricks.sdk.service.sql import Disposition, Format, StatementState
+
+        logger.info("Executing query on warehouse %s...", self.warehouse_id)
+
+        use_arrow = max_rows is not None and max_rows > ARROW_ROW_THRESHOLD
 
         # Execute the statement
         statement = self.w.statement_execution.execute_statement(
             warehouse_id=self.warehouse_id,
             statement=sql_query,
-            format=Format.JSON_ARRAY,
-            disposition=Disposition.INLINE,
+            parameters=parameters,
+            format=Format.ARROW_STREAM if use_arrow else Format.JSON_ARRAY,
+            disposition=Disposition.EXTERNAL_LINKS if use_arrow else Disposition.INLINE,
+            row_limit=max_rows,
             wait_timeout="30s"
         )
 
-        # Wait for completion
+        # Keep polling with backoff if the statement outlived the wait timeout,
+        # cancelling it on the warehouse if it overruns or the wait is interrupted
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        try:
+            while statement.status.state in (StatementState.PENDING, StatementState.RUNNING):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.w.statement_execution.cancel_execution(statement.statement_id)
+                    raise RuntimeError(
+                        f"Query failed with state: {statement.status.state}"
+                        f"\nError: Timed out after {timeout:g}s; statement cancelled"
+                    )
+                time.sleep(min(0.5 * 2 ** attempt, 5, remaining))
+                attempt += 1
+                statement = self.w.statement_execution.get_statement(statement.statement_id)
+        except KeyboardInterrupt as e:
+            self.w.statement_execution.cancel_execution(statement.statement_id)
+            raise RuntimeError(
+                f"Query failed with state: {statement.status.state}"
+                "\nError: Interrupted; statement cancelled"
+            ) from e
+
+        # Check the final state
         if statement.status.state == StatementState.SUCCEEDED:
-            print(f"Query executed successfully. Rows returned: {statement.result.row_count}")
+            logger.info(
+                "Query executed successfully. Rows returned: %s",
+                statement.manifest.total_row_count
+            )
 
             # Extract data
-            if statement.result and statement.result.data_array:
-                columns = [col.name for col in statement.manifest.schema.columns]
-                rows = []
-
-                for row_data in statement.result.data_array:
-                    row_dict = dict(zip(columns, row_data))
-                    rows.append(row_dict)
-
-                return rows
+            columns = [col.name for col in statement.manifest.schema.columns]
+            if use_arrow:
+                table = self._fetch_arrow_result(statement)
+                if table is not None:
+                    return QueryResult(columns, table)
+                logger.info("No data returned from query")
+                return QueryResult(columns, [])
+            elif statement.result and statement.result.data_array:
+                return QueryResult(columns, statement.result.data_array)
             else:
-                print("No data returned from query")
-                return []
+                logger.info("No data returned from query")
+                return QueryResult(columns, [])
         else:
             error_msg = f"Query failed with state: {statement.status.state}"
             if statement.status.error:
                 error_msg += f"\nError: {statement.status.error.message}"
             raise RuntimeError(error_msg)
 
+    async def execute_query_async(
+        self,
+        sql_query: str,
+        max_rows: Optional[int] = None,
+        parameters: Optional[List['StatementParameterListItem']] = None,
+        timeout: float = QUERY_TIMEOUT_SECONDS
+    ) -> QueryResult:
+        """
+        Execute a SQL query in a worker thread without blocking the event loop.
+
+        Lets independent queries run concurrently, e.g. with asyncio.gather().
+
+        Args:
+            sql_query: SQL query to execute, may reference :name parameter markers
+            max_rows: Optional limit on the number of rows returned
+            parameters: Optional values for the query's parameter markers
+            timeout: Seconds to wait for the statement before cancelling it
+
+        Returns:
+            QueryResult with the column names and the row values
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, partial(
+                self.execute_query, sql_query,
+                max_rows=max_rows, parameters=parameters, timeout=timeout
+            )
+        )
+
+    def _fetch_arrow_result(self, statement):
+        """
+        Download the Arrow chunks of an EXTERNAL_LINKS statement result.
+
+        Chunks are fetched concurrently and reassembled in chunk order.
+
+        Args:
+            statement: Succeeded statement response
+
+        Returns:
+            pyarrow.Table with all result rows, or None if there are no chunks
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        import httpx
+        import pyarrow as pa
+
+        chunk_count = statement.manifest.total_chunk_count or 0
+        if not chunk_count:
+            return None
+
+        def fetch_chunk(chunk_index: int):
+            if chunk_index == 0:
+                result = statement.result
+            else:
+                result = self.w.statement_execution.get_statement_result_chunk_n(
+                    statement.statement_id, chunk_index
+                )
+
+            tables = []
+            for link in result.external_links or []:
+                response = client.get(link.external_link, headers=link.http_headers)
+                response.raise_for_status()
+                tables.append(pa.ipc.open_stream(response.content).read_all())
+            return tables
+
+        # Presigned links must not carry the Databricks credentials, so use a
+        # plain client rather than the workspace API client
+        with httpx.Client(http2=True, timeout=60.0) as client:
+            with ThreadPoolExecutor(max_workers=min(ARROW_FETCH_WORKERS, chunk_count)) as pool:
+                chunks = list(pool.map(fetch_chunk, range(chunk_count)))
+
+        tables = [table for chunk in chunks for table in chunk]
+        if not tables:
+            return None
+        return pa.concat_tables(tables)
+
     def create_pdf(
         self,
-        data: List[Dict[str, Any]],
-        output_path: str,
+        data: QueryResult,
+        output_path: Union[str, BinaryIO],
         title: str = "Dashboard Export",
         page_size: str = "LETTER",
-        orientation: str = "landscape"
-    ) -> str:
+        orientation: str = "landscape",
+        fast: Optional[bool] = None
+    ) -> Union[str, BinaryIO]:
         """
         Create a PDF from query results.
 
         Args:
-            data: List of dictionaries representing table rows
-            output_path: Path to save the PDF file
+            data: QueryResult from execute_query()
+            output_path: Path to save the PDF file, or a binary file-like object
+                (e.g. io.BytesIO) to write it to
             title: Title for the PDF document
             page_size: Page size (LETTER or A4)
             orientation: Page orientation (portrait or landscape)
+            fast: Render with create_pdf_fast(); defaults to True for results
+                with more than FAST_PDF_ROW_THRESHOLD rows
 
         Returns:
-            Path to the created PDF file
+            The output path or file-like object the PDF was written to
         """
-        if not data:
+        columns, rows = data
+        if not rows:
             raise ValueError("No data to export to PDF")
 
-        print(f"Creating PDF with {len(data)} rows...")
+        if fast is None:
+            fast = len(rows) > FAST_PDF_ROW_THRESHOLD
+        if fast:
+            return self.create_pdf_fast(data, output_path, title, page_size, orientation)
 
-        # Determine page size
-        if page_size.upper() == "A4":
-            page = A4
-        else:
-            page = letter
+        rl = _get_reportlab()
+        inch = rl.inch
 
-        if orientation.lower() == "landscape":
-            page = landscape(page)
+        logger.info("Creating PDF with %d rows...", len(rows))
+
+        page = _resolve_page_size(page_size, orientation)
 
         # Create PDF
-        pdf = SimpleDocTemplate(
+        pdf = rl.SimpleDocTemplate(
             output_path,
             pagesize=page,
+            pageCompression=1,
             topMargin=0.5*inch,
             bottomMargin=0.5*inch,
             leftMargin=0.5*inch,
@@ -151,93 +521,149 @@ class DashboardExporter:
         # Container for elements
         elements = []
 
-        # Styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#1a1a1a'),
-            spaceAfter=12,
-            alignment=TA_CENTER
-        )
-
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#666666'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
+        styles = _get_paragraph_styles()
 
         # Add title
-        elements.append(Paragraph(title, title_style))
+        elements.append(rl.Paragraph(title, styles.title))
 
         # Add timestamp
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        elements.append(Paragraph(f"Generated: {timestamp}", subtitle_style))
+        elements.append(rl.Paragraph(f"Generated: {timestamp}", styles.subtitle))
 
         # Prepare table data
-        columns = list(data[0].keys())
-        table_data = [columns]  # Header row
-
-        for row in data:
-            table_data.append([str(row.get(col, '')) for col in columns])
-
-        # Calculate column widths dynamically
-        page_width = page[0] - 1*inch  # Account for margins
-        col_width = page_width / len(columns)
-        col_widths = [col_width] * len(columns)
-
-        # Create table
-        table = Table(table_data, colWidths=col_widths, repeatRows=1)
-
-        # Style the table
-        table_style = TableStyle([
-            # Header styling
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-
-            # Body styling
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('TOPPADDING', (0, 1), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-
-            # Alternating row colors
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
-
-            # Grid
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ])
+        body = _stringify_rows(rows)
 
+        col_widths = _compute_col_widths(page, len(columns))
+        table_style = _build_table_style()
+
+        # LongTable splits across pages more cheaply than Table and repeats
+        # the header row only at the top of each page
+        table = rl.LongTable([columns] + body, colWidths=col_widths, repeatRows=1)
         table.setStyle(table_style)
         elements.append(table)
 
         # Add footer with row count
-        elements.append(Spacer(1, 0.2*inch))
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#666666'),
-            alignment=TA_CENTER
-        )
-        elements.append(Paragraph(f"Total rows: {len(data)}", footer_style))
+        elements.append(rl.Spacer(1, 0.2*inch))
+        elements.append(rl.Paragraph(f"Total rows: {len(rows)}", styles.footer))
 
         # Build PDF
         pdf.build(elements)
-        print(f"PDF created successfully: {output_path}")
+        if isinstance(output_path, str):
+            logger.info("PDF created successfully: %s", output_path)
+        else:
+            logger.info("PDF created successfully")
+
+        return output_path
+
+    def create_pdf_fast(
+        self,
+        data: QueryResult,
+        output_path: Union[str, BinaryIO],
+        title: str = "Dashboard Export",
+        page_size: str = "LETTER",
+        orientation: str = "landscape"
+    ) -> Union[str, BinaryIO]:
+        """
+        Create a PDF from query results by drawing rows directly on a canvas.
+
+        Skips reportlab's table layout, so time and memory stay linear in the
+        row count. Cells are drawn on a single line and truncated to fit their
+        column; there is no grid, only alternating row backgrounds.
+
+        Args:
+            data: QueryResult from execute_query()
+            output_path: Path to save the PDF file, or a binary file-like object
+                (e.g. io.BytesIO) to write it to
+            title: Title for the PDF document
+            page_size: Page size (LETTER or A4)
+            orientation: Page orientation (portrait or landscape)
+
+        Returns:
+            The output path or file-like object the PDF was written to
+        """
+        columns, rows = data
+        if not rows:
+            raise ValueError("No data to export to PDF")
+
+        rl = _get_reportlab()
+        colors = rl.colors
+        inch = rl.inch
+
+        logger.info("Creating PDF with %d rows...", len(rows))
+
+        page = _resolve_page_size(page_size, orientation)
+        page_width, page_height = page
+        margin = 0.5*inch
+        padding = 4
+        header_height = 20
+        row_height = 14
+        body_font, body_size = 'Helvetica', 8
+        header_font, header_size = 'Helvetica-Bold', 10
+        table_width = page_width - 2*margin
+
+        col_widths = _compute_col_widths(page, len(columns))
+        col_x = [margin + sum(col_widths[:i]) for i in range(len(columns))]
+        header = [
+            _fit_text(str(col), width - 2*padding, header_font, header_size)
+            for col, width in zip(columns, col_widths)
+        ]
+        body = _stringify_rows(rows)
+
+        c = rl.Canvas(output_path, pagesize=page, pageCompression=1)
+
+        def draw_header(top: float) -> float:
+            c.setFillColor(colors.HexColor('#2E86AB'))
+            c.rect(margin, top - header_height, table_width, header_height, stroke=0, fill=1)
+            c.setFillColor(colors.whitesmoke)
+            c.setFont(header_font, header_size)
+            baseline = top - header_height + (header_height - header_size) / 2 + 1
+            for x, width, text in zip(col_x, col_widths, header):
+                c.drawCentredString(x + width / 2, baseline, text)
+            c.setFont(body_font, body_size)
+            return top - header_height
+
+        # Title block on the first page
+        y = page_height - margin
+        c.setFillColor(colors.HexColor('#1a1a1a'))
+        c.setFont('Helvetica-Bold', 16)
+        c.drawCentredString(page_width / 2, y - 16, title)
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        c.setFillColor(colors.HexColor('#666666'))
+        c.setFont('Helvetica', 10)
+        c.drawCentredString(page_width / 2, y - 34, f"Generated: {timestamp}")
+        y = draw_header(y - 50)
+
+        shade = colors.HexColor('#f5f5f5')
+        text_offset = (row_height - body_size) / 2 + 1
+        for index, row in enumerate(body):
+            if y - row_height < margin:
+                c.showPage()
+                y = draw_header(page_height - margin)
+
+            y -= row_height
+            if index % 2:
+                c.setFillColor(shade)
+                c.rect(margin, y, table_width, row_height, stroke=0, fill=1)
+            c.setFillColor(colors.black)
+            for x, width, cell in zip(col_x, col_widths, row):
+                c.drawString(
+                    x + padding, y + text_offset,
+                    _fit_text(cell, width - 2*padding, body_font, body_size)
+                )
+
+        # Footer with row count
+        if y - 0.2*inch - 8 < margin:
+            c.showPage()
+            y = page_height - margin
+        c.setFillColor(colors.HexColor('#666666'))
+        c.setFont('Helvetica', 8)
+        c.drawCentredString(page_width / 2, y - 0.2*inch - 8, f"Total rows: {len(rows)}")
+
+        c.save()
+        if isinstance(output_path, str):
+            logger.info("PDF created successfully: %s", output_path)
+        else:
+            logger.info("PDF created successfully")
 
         return output_path
 
@@ -246,23 +672,36 @@ class DashboardExporter:
         to_emails: List[str],
         subject: str,
         body: str,
-        pdf_path: str,
-        cc_emails: Optional[List[str]] = None
+        pdf_path: Optional[str] = None,
+        cc_emails: Optional[List[str]] = None,
+        pdf_bytes: Optional[bytes] = None,
+        pdf_name: Optional[str] = None
     ):
         """
         Send email with PDF attachment.
 
+        The attachment is read from pdf_path, or taken from pdf_bytes when
+        the PDF was built in memory.
+
         Args:
             to_emails: List of recipient email addresses
             subject: Email subject
             body: Email body (plain text or HTML)
             pdf_path: Path to PDF file to attach
             cc_emails: Optional list of CC email addresses
+            pdf_bytes: PDF content to attach instead of reading pdf_path
+            pdf_name: Attachment filename for pdf_bytes
         """
-        print(f"Sending email to {', '.join(to_emails)}...")
+        if (pdf_path is None) == (pdf_bytes is None):
+            raise ValueError("Exactly one of pdf_path or pdf_bytes must be given")
+
+        import smtplib
+        from email.message import EmailMessage
+
+        logger.info("Sending email to %s...", ', '.join(to_emails))
 
         # Create message
-        msg = MIMEMultipart()
+        msg = EmailMessage()
         msg['From'] = self.from_email
         msg['To'] = ', '.join(to_emails)
         if cc_emails:
@@ -270,43 +709,74 @@ class DashboardExporter:
         msg['Subject'] = subject
 
         # Add body
-        msg.attach(MIMEText(body, 'plain'))
+        msg.set_content(body)
 
         # Attach PDF
-        with open(pdf_path, 'rb') as f:
-            pdf_attachment = MIMEApplication(f.read(), _subtype='pdf')
-            pdf_attachment.add_header(
-                'Content-Disposition',
-                'attachment',
-                filename=Path(pdf_path).name
-            )
-            msg.attach(pdf_attachment)
+        if pdf_bytes is None:
+            with open(pdf_path, 'rb') as f:
+                pdf_bytes = f.read()
+            pdf_name = Path(pdf_path).name
+
+        msg.add_attachment(
+            pdf_bytes,
+            maintype='application',
+            subtype='pdf',
+            cte='base64',
+            filename=pdf_name or 'dashboard_export.pdf'
+        )
 
         # Send email
         try:
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
+            all_recipients = to_emails + (cc_emails or [])
+            try:
+                self._get_smtp().send_message(msg, self.from_email, all_recipients)
+            except smtplib.SMTPServerDisconnected:
+                # The server dropped the connection after our liveness check
+                self.close()
+                self._get_smtp().send_message(msg, self.from_email, all_recipients)
 
-                all_recipients = to_emails + (cc_emails or [])
-                server.send_message(msg, self.from_email, all_recipients)
-
-            print("Email sent successfully!")
+            logger.info("Email sent successfully!")
 
         except Exception as e:
-            print(f"Failed to send email: {str(e)}")
+            logger.error("Failed to send email: %s", e)
+            raise
+
+    def _get_smtp(self):
+        """Return the cached SMTP connection, reconnecting if it has gone stale."""
+        import smtplib
+
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except smtplib.SMTPServerDisconnected:
+                pass
+            self.close()
+
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+        try:
+            server.starttls()
+            server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
             raise
 
+        self._smtp = server
+        return server
+
     def export_and_email(
         self,
         sql_query: str,
         to_emails: List[str],
         subject: str,
         title: str = "Dashboard Export",
-        output_dir: str = "./exports",
+        output_dir: Optional[str] = None,
         page_size: str = "LETTER",
         orientation: str = "landscape",
-        cc_emails: Optional[List[str]] = None
+        cc_emails: Optional[List[str]] = None,
+        max_rows: Optional[int] = None,
+        parameters: Optional[List['StatementParameterListItem']] = None,
+        timeout: float = QUERY_TIMEOUT_SECONDS
     ):
         """
         Complete workflow: Execute query, create PDF, and send email.
@@ -316,35 +786,46 @@ class DashboardExporter:
             to_emails: List of recipient email addresses
             subject: Email subject
             title: Title for the PDF document
-            output_dir: Directory to save PDF files
+            output_dir: Optional directory to archive the PDF in; by default the
+                PDF is built in memory and only attached to the email
             page_size: Page size (LETTER or A4)
             orientation: Page orientation (portrait or landscape)
             cc_emails: Optional list of CC email addresses
+            max_rows: Optional limit on the number of rows exported
+            parameters: Optional values for the query's parameter markers
+            timeout: Seconds to wait for the query before cancelling it
         """
-        # Create output directory
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
-
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         pdf_filename = f"dashboard_export_{timestamp}.pdf"
-        pdf_path = os.path.join(output_dir, pdf_filename)
 
         try:
             # Step 1: Execute query
-            data = self.execute_query(sql_query)
+            data = self.execute_query(
+                sql_query, max_rows=max_rows, parameters=parameters, timeout=timeout
+            )
 
-            if not data:
-                print("No data to export. Exiting.")
+            if not data.rows:
+                logger.info("No data to export. Exiting.")
                 return
 
-            # Step 2: Create PDF
+            # Step 2: Create PDF in memory
+            buf = io.BytesIO()
             self.create_pdf(
                 data=data,
-                output_path=pdf_path,
+                output_path=buf,
                 title=title,
                 page_size=page_size,
                 orientation=orientation
             )
+            pdf_bytes = buf.getvalue()
+
+            pdf_path = None
+            if output_dir:
+                Path(output_dir).mkdir(parents=True, exist_ok=True)
+                pdf_path = os.path.join(output_dir, pdf_filename)
+                with open(pdf_path, 'wb') as f:
+                    f.write(pdf_bytes)
 
             # Step 3: Send email
             email_body = f"""
@@ -354,8 +835,8 @@ Please find attached the dashboard export report: {title}
 
 Report Details:
 - Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-- Total Rows: {len(data)}
-- Columns: {len(data[0])}
+- Total Rows: {len(data.rows)}
+- Columns: {len(data.columns)}
 
 This is an automated report generated from Databricks AI/BI Dashboard.
 
@@ -367,19 +848,36 @@ Databricks Export System
                 to_emails=to_emails,
                 subject=subject,
                 body=email_body,
-                pdf_path=pdf_path,
-                cc_emails=cc_emails
+                cc_emails=cc_emails,
+                pdf_bytes=pdf_bytes,
+                pdf_name=pdf_filename
             )
 
-            print(f"\n✓ Export complete! PDF saved to: {pdf_path}")
+            if pdf_path:
+                logger.info("✓ Export complete! PDF saved to: %s", pdf_path)
+            else:
+                logger.info("✓ Export complete!")
 
         except Exception as e:
-            print(f"\n✗ Export failed: {str(e)}")
+            logger.error("✗ Export failed: %s", e)
             raise
 
 
+def configure_logging() -> None:
+    """Print progress messages to the console at the level set by LOG_LEVEL."""
+    level_name = (os.getenv('LOG_LEVEL') or 'INFO').upper()
+    level = logging.getLevelName(level_name)
+    valid = isinstance(level, int)
+    logging.basicConfig(level=level if valid else logging.INFO, format='%(message)s')
+    if not valid:
+        logger.warning("Unknown LOG_LEVEL %r, using INFO", level_name)
+
+
 def main():
     """Main entry point for the script."""
+    import sys
+
+    configure_logging()
 
     # Load configuration from environment variables
     WAREHOUSE_ID = os.getenv('DATABRICKS_WAREHOUSE_ID')
@@ -400,8 +898,8 @@ def main():
 
     missing_vars = [k for k, v in required_vars.items() if not v]
     if missing_vars:
-        print(f"Error: Missing required environment variables: {', '.join(missing_vars)}")
-        print("Please set these in your .env file or environment")
+        logger.error("Error: Missing required environment variables: %s", ', '.join(missing_vars))
+        logger.error("Please set these in your .env file or environment")
         sys.exit(1)
 
     # Initialize exporter
@@ -427,15 +925,17 @@ def main():
     TITLE = 'AI/BI Dashboard Export'
 
     # Run the export
-    exporter.export_and_email(
-        sql_query=SQL_QUERY,
-        to_emails=TO_EMAILS,
-        subject=SUBJECT,
-        title=TITLE,
-        cc_emails=CC_EMAILS,
-        page_size="LETTER",
-        orientation="landscape"
-    )
+    with exporter:
+        exporter.export_and_email(
+            sql_query=SQL_QUERY,
+            to_emails=TO_EMAILS,
+            subject=SUBJECT,
+            title=TITLE,
+            cc_emails=CC_EMAILS,
+            output_dir="./exports",
+            page_size="LETTER",
+            orientation="landscape"
+        )
 
 
 if __name__ == "__main__":